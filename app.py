@@ -1,17 +1,21 @@
-from flask import Flask, jsonify, request, render_template
+from flask import Flask, jsonify, request, render_template, Response, url_for
 from flask_compress import Compress
 import datetime
+import hashlib
+import math
 import threading
 import time
 import os
+import shutil
+import numpy as np
 from dateutil import parser
-from sattrack import config, tle, calculations, webhook_manager
+from sattrack import config, tle, calculations, webhook_manager, payload_cache, job_store, ephemeris_jobs, close_approach
+from sattrack.ephemeris import Ephemeris
 from apscheduler.schedulers.background import BackgroundScheduler
 
-# Scheduler init
+# Scheduler init - only started in the elected leader process (see start_background_services)
+# Recording jobs themselves live in job_store so every worker sees the same list.
 scheduler = BackgroundScheduler()
-scheduler.start()
-scheduled_jobs = {} # Keep track of metadata if needed
 
 
 app = Flask(__name__)
@@ -20,19 +24,38 @@ Compress(app)  # Enable GZIP compression
 # ========== LAZY LOADING STATE ==========
 sat_config = None
 app_settings = None
-all_sats = None
+all_sats = None  # tle.SatelliteCatalog
 my_sats = None
 calculator = None
+# (ephemeris.Ephemeris, center_time, Skyfield Time grid) - swapped as one tuple so readers
+# never mix versions; the grid is reused when adding satellites
 cached_ephemeris = None
-cached_ephemeris_time = None
+cached_ephemeris_payload = None  # Pre-serialized /api/ephemeris body, rebuilt lazily
+EPHEMERIS_HOURS_RADIUS = 48
+EPHEMERIS_STEP_SECONDS = 15
+EPHEMERIS_RECENTER_HOURS = 12  # A published center older than this is replaced on startup
+EPHEMERIS_WINDOW_MAX_DAYS = 30  # Async windows further from the default center are refused
+PUBLISHED_EPHEMERIS_KEEP = 2  # Track directories kept on disk (followers may still map the previous one)
 _initialized = False
 _init_lock = threading.Lock()
 
-def ensure_initialized():
-    """Lazy initialization - loads data on first request."""
+# ========== MULTI-PROCESS STATE ==========
+_is_leader = False
+_state_mtimes = {}  # Data file -> mtime this process last loaded/wrote
+_last_state_check = 0
+STATE_CHECK_INTERVAL = 2  # seconds
+STATE_FILES = (config.JSON_FILE, config.SETTINGS_FILE, config.TLE_CACHE_FILE, config.EPHEMERIS_STATE_FILE)
+
+def ensure_initialized(start_services=True):
+    """
+    Lazy initialization - loads data on first request.
+    The preforking server calls this once in the master with start_services=False;
+    workers then inherit the loaded data copy-on-write.
+    """
     global sat_config, all_sats, my_sats, calculator, _initialized, app_settings
     
     if _initialized:
+        sync_shared_state()
         return
     
     with _init_lock:
@@ -56,18 +79,106 @@ def ensure_initialized():
         
         enrich_sats()
         calculator = calculations.OrbitCalculator()
+        apply_location_settings()
         
         print("Pre-calculating ephemeris...")
-        refresh_ephemeris()
+        refresh_ephemeris(published_ephemeris_center(max_age_hours=EPHEMERIS_RECENTER_HOURS))
+        remember_state_files()
         
-        # Start background TLE refresh thread
-        tle_thread = threading.Thread(target=tle_refresh_thread, daemon=True)
-        tle_thread.start()
-        print("Background TLE refresh thread started")
+        if start_services:
+            start_background_services()
         
         _initialized = True
         print("Initialization complete!")
 
+def apply_location_settings():
+    """Applies persisted station location so all processes agree on it."""
+    if 'latitude' in app_settings: config.LATITUDE = float(app_settings['latitude'])
+    if 'longitude' in app_settings: config.LONGITUDE = float(app_settings['longitude'])
+    if 'min_elevation' in app_settings: config.MIN_ELEVATION = float(app_settings['min_elevation'])
+    calculator.reload_observer()
+
+def start_background_services():
+    """
+    Starts the recording scheduler and the TLE refresh thread, but only in the
+    process that wins the leader lock - otherwise every worker would fire webhooks.
+    """
+    global _is_leader
+    if _is_leader or not job_store.try_acquire_leadership():
+        return
+    _is_leader = True
+    
+    scheduler.start()
+    # Picks up recordings scheduled through other worker processes
+    scheduler.add_job(sync_scheduled_jobs, 'interval', seconds=5, id='sync_jobs')
+    sync_scheduled_jobs()
+    
+    tle_thread = threading.Thread(target=tle_refresh_thread, daemon=True)
+    tle_thread.start()
+    print(f"Process {os.getpid()} elected leader: scheduler and TLE refresh thread started")
+
+def _file_mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+def remember_state_files(*paths):
+    """
+    Records data file versions after this process loaded or wrote them.
+    Pass only the files actually written - a change another process made to
+    the others must still be picked up by sync_shared_state.
+    """
+    for path in paths or STATE_FILES:
+        _state_mtimes[path] = _file_mtime(path)
+
+def sync_shared_state():
+    """
+    Reloads config/settings/TLE data that another worker process changed on disk.
+    Checked at most every STATE_CHECK_INTERVAL seconds (a few stat() calls).
+    The default ephemeris is replaced only when the leader publishes a new
+    one, and then loaded from its files - all processes serve the identical
+    window (and ETag) without propagating it again.
+    """
+    global _last_state_check, sat_config, app_settings, all_sats, my_sats
+    
+    now = time.time()
+    if now - _last_state_check < STATE_CHECK_INTERVAL:
+        return
+    _last_state_check = now
+    
+    # Take over if the previous leader process died
+    start_background_services()
+    
+    # Busy (initializing or refreshing TLEs in this process) - check again later
+    if not _init_lock.acquire(blocking=False):
+        return
+    try:
+        # Versions as seen now; anything written after this is picked up next time
+        current = {path: _file_mtime(path) for path in STATE_FILES}
+        changed = {path for path in STATE_FILES if current[path] != _state_mtimes.get(path)}
+        if not changed:
+            return
+        
+        print(f"Reloading shared state changed by another process: {', '.join(sorted(changed))}")
+        if config.SETTINGS_FILE in changed:
+            app_settings = config.load_settings() or app_settings
+            apply_location_settings()
+            invalidate_ephemeris_payload()
+        if config.TLE_CACHE_FILE in changed:
+            all_sats = tle.get_tle_data()
+        if config.JSON_FILE in changed:
+            apply_sat_config(config.load_sat_config())
+        if config.TLE_CACHE_FILE in changed:
+            # Positions follow when the leader publishes the window for the new TLEs
+            my_sats = tle.filter_satellites(all_sats, sat_config)
+            enrich_sats()
+        if config.EPHEMERIS_STATE_FILE in changed:
+            refresh_ephemeris(published_ephemeris_center())
+        _state_mtimes.update(current)
+    finally:
+        _init_lock.release()
+
 # Attach metadata to satellite objects
 def enrich_sats():
     for sat in my_sats:
@@ -76,23 +187,173 @@ def enrich_sats():
         sat.transmission_radius_km = float(meta.get('transmission_radius_km', 1500))
 
 # ========== EPHEMERIS CACHING ==========
-def refresh_ephemeris():
-    global cached_ephemeris, cached_ephemeris_time
-    now = datetime.datetime.now(datetime.timezone.utc)
-    cached_ephemeris = calculator.generate_ephemeris(my_sats, now, hours_radius=48, step_seconds=15)
-    cached_ephemeris_time = now
-    print(f"Ephemeris cached at {now.isoformat()} (±48 hours)")
+def published_ephemeris_center(max_age_hours=None):
+    """
+    Center time of the default ephemeris shared by all processes, or None.
+    With max_age_hours (startup), only a recent one published for the current
+    TLE file is returned.
+    """
+    state = config.load_ephemeris_state()
+    if not state.get('center_time'):
+        return None
+    center_time = datetime.datetime.fromisoformat(state['center_time'])
+    if max_age_hours is not None:
+        age = datetime.datetime.now(datetime.timezone.utc) - center_time
+        if abs(age.total_seconds()) > max_age_hours * 3600:
+            return None
+        if state.get('tle_mtime') != _file_mtime(config.TLE_CACHE_FILE):
+            return None
+    return center_time
+
+def published_tracks_dir(center_time):
+    return os.path.join(config.EPHEMERIS_TRACKS_DIR, str(int(center_time.timestamp() * 1000)))
+
+def publish_ephemeris(ephemeris, center_time):
+    """Saves the tracks, then announces them via the state file (which followers watch)."""
+    os.makedirs(config.EPHEMERIS_TRACKS_DIR, exist_ok=True)
+    ephemeris.save(published_tracks_dir(center_time))
+    config.save_ephemeris_state({
+        'center_time': center_time.isoformat(),
+        'tle_mtime': _file_mtime(config.TLE_CACHE_FILE)
+    })
+    
+    published = sorted((name for name in os.listdir(config.EPHEMERIS_TRACKS_DIR) if name.isdigit()), key=int)
+    for name in published[:-PUBLISHED_EPHEMERIS_KEEP]:
+        shutil.rmtree(os.path.join(config.EPHEMERIS_TRACKS_DIR, name), ignore_errors=True)
+
+def refresh_ephemeris(center_time=None):
+    """
+    Sets the default ephemeris around center_time, loading the published
+    tracks and propagating only satellites missing from them. Without a
+    center, the window is re-centered on now, computed and published for the
+    other processes.
+    """
+    global cached_ephemeris
+    publish = center_time is None
+    if publish:
+        center_time = datetime.datetime.now(datetime.timezone.utc)
+    grid = calculator.ephemeris_grid(center_time, hours_radius=EPHEMERIS_HOURS_RADIUS,
+                                     step_seconds=EPHEMERIS_STEP_SECONDS)
+    
+    published = None if publish else Ephemeris.load(published_tracks_dir(center_time))
+    loaded = published is not None and np.array_equal(published.times, calculator.unix_seconds(grid))
+    if loaded:
+        missing = [sat for sat in my_sats if sat.model.satnum not in published]
+        ephemeris = published.subset({sat.model.satnum for sat in my_sats})
+        if missing:
+            ephemeris = ephemeris.merged(calculator.generate_ephemeris(
+                missing, center_time, hours_radius=EPHEMERIS_HOURS_RADIUS,
+                step_seconds=EPHEMERIS_STEP_SECONDS, times=grid))
+    else:
+        ephemeris = calculator.generate_ephemeris(my_sats, center_time, hours_radius=EPHEMERIS_HOURS_RADIUS,
+                                                  step_seconds=EPHEMERIS_STEP_SECONDS, times=grid)
+    
+    if publish:
+        publish_ephemeris(ephemeris, center_time)
+    cached_ephemeris = (ephemeris, center_time, grid)
+    invalidate_ephemeris_payload()
+    print(f"Ephemeris {'loaded' if loaded else 'cached'} at {center_time.isoformat()} "
+          f"(±{EPHEMERIS_HOURS_RADIUS} hours, {ephemeris.nbytes() // 1024} KiB)")
+
+def apply_sat_config(new_config):
+    """
+    Switches to a new tracked list without rebuilding the whole ephemeris:
+    only newly added satellites are propagated (on the cached time grid),
+    removed ones are dropped and metadata-only edits just re-enrich.
+    Caller holds _init_lock.
+    """
+    global sat_config, my_sats, cached_ephemeris
+    
+    ephemeris, center_time, grid = cached_ephemeris
+    tracked_ids = {sat.model.satnum for sat in my_sats}
+    
+    # Re-filtering the tracked list drops removed sats and applies renamed entries
+    kept = tle.filter_satellites(my_sats, new_config)
+    added_config = {k: v for k, v in new_config.items() if k.isdigit() and int(k) not in tracked_ids}
+    added = tle.filter_satellites(all_sats, added_config) if added_config else []
+    
+    kept_ids = {sat.model.satnum for sat in kept}
+    ephemeris = ephemeris.subset(kept_ids)
+    if added:
+        ephemeris = ephemeris.merged(calculator.generate_ephemeris(added, center_time,
+                                                                   hours_radius=EPHEMERIS_HOURS_RADIUS,
+                                                                   step_seconds=EPHEMERIS_STEP_SECONDS,
+                                                                   times=grid))
+    
+    sat_config = new_config
+    my_sats = kept + added
+    enrich_sats()
+    cached_ephemeris = (ephemeris, center_time, grid)  # Swap in one step for concurrent readers
+    invalidate_ephemeris_payload()
+    print(f"Tracked list updated: {len(added)} added, {len(tracked_ids) - len(kept)} removed, "
+          f"{len(my_sats)} tracked")
+
+def invalidate_ephemeris_payload():
+    """Drops encoded ephemeris responses (default + async windows); call whenever their content changes."""
+    global cached_ephemeris_payload
+    cached_ephemeris_payload = None
+    window_jobs.clear()
+
+def get_ephemeris_payload():
+    """Returns the encoded default ephemeris response, building it once per version."""
+    global cached_ephemeris_payload
+    payload = cached_ephemeris_payload
+    if payload is None:
+        ephemeris, center_time, _ = cached_ephemeris
+        payload = payload_cache.PrecompressedPayload({
+            'center_time': center_time.isoformat(),
+            'ephemeris': ephemeris.to_points(),
+            'satellites': sat_config,
+            'min_elevation': config.MIN_ELEVATION
+        })
+        cached_ephemeris_payload = payload
+        print(f"Ephemeris payload encoded ({len(payload.body) // 1024} KiB raw, ETag {payload.etag[:12]})")
+    return payload
+
+def compute_ephemeris_window(center_time, progress=None):
+    """Encoded ephemeris response for an arbitrary window (runs in the job pool)."""
+    ephemeris = calculator.generate_ephemeris(list(my_sats), center_time, hours_radius=EPHEMERIS_HOURS_RADIUS,
+                                              step_seconds=EPHEMERIS_STEP_SECONDS, progress=progress)
+    return payload_cache.PrecompressedPayload({
+        'center_time': center_time.isoformat(),
+        'ephemeris': ephemeris.to_points(),
+        'satellites': sat_config,
+        'min_elevation': config.MIN_ELEVATION
+    })
+
+def state_version():
+    """
+    Short token for the data files this process has loaded (TLEs, config,
+    settings and the published ephemeris center). Equal in all processes
+    once they are in sync; costs no ephemeris or payload work.
+    """
+    versions = sorted((path, _state_mtimes.get(path)) for path in STATE_FILES)
+    return hashlib.sha1(repr(versions).encode('utf-8')).hexdigest()[:16]
+
+# Windows snap to half the radius, so a window is still centered within ±12h of
+# the requested time; neighbours one full radius away are prefetched.
+# Finished windows are shared between worker processes through EPHEMERIS_WINDOW_DIR,
+# versioned by state_version().
+window_jobs = ephemeris_jobs.EphemerisJobManager(compute_ephemeris_window,
+                                                 bucket_seconds=EPHEMERIS_HOURS_RADIUS * 3600 // 2,
+                                                 store_dir=config.EPHEMERIS_WINDOW_DIR,
+                                                 version=state_version,
+                                                 reference_time=lambda: cached_ephemeris[1],
+                                                 max_distance_seconds=EPHEMERIS_WINDOW_MAX_DAYS * 86400)
+PREFETCH_DISTANCE_BUCKETS = 2
 
 def refresh_tle_and_ephemeris():
-    """Refreshes TLE data and recalculates ephemeris."""
+    """Refreshes TLE data and recalculates ephemeris (leader only; followers sync from the files)."""
     global all_sats, my_sats
     print("Background TLE refresh triggered...")
     
-    # Force download by deleting cache file age check
-    all_sats = tle.get_tle_data(max_age_days=0)  # Force fresh download
-    my_sats = tle.filter_satellites(all_sats, sat_config)
-    enrich_sats()
-    refresh_ephemeris()
+    with _init_lock:
+        # Force download by deleting cache file age check
+        all_sats = tle.get_tle_data(max_age_days=0)  # Force fresh download
+        my_sats = tle.filter_satellites(all_sats, sat_config)
+        enrich_sats()
+        refresh_ephemeris()  # Re-centers on now and publishes it
+        remember_state_files(config.TLE_CACHE_FILE, config.EPHEMERIS_STATE_FILE)
     print(f"TLE and ephemeris refreshed. Tracking {len(my_sats)} satellites.")
 
 def tle_refresh_thread():
@@ -138,9 +399,10 @@ def handle_config():
     global sat_config, my_sats, app_settings
     if request.method == 'POST':
         data = request.json
-        if 'latitude' in data: config.LATITUDE = float(data['latitude'])
-        if 'longitude' in data: config.LONGITUDE = float(data['longitude'])
-        if 'min_elevation' in data: config.MIN_ELEVATION = float(data['min_elevation'])
+        # Location is persisted with the settings so other worker processes pick it up
+        if 'latitude' in data: app_settings['latitude'] = float(data['latitude'])
+        if 'longitude' in data: app_settings['longitude'] = float(data['longitude'])
+        if 'min_elevation' in data: app_settings['min_elevation'] = float(data['min_elevation'])
         
         # Update settings
         if 'webhook_url' in data: app_settings['webhook_url'] = data['webhook_url']
@@ -148,8 +410,10 @@ def handle_config():
         
         # Save settings
         config.save_settings(app_settings)
+        remember_state_files(config.SETTINGS_FILE)
         
-        calculator.reload_observer()
+        apply_location_settings()
+        invalidate_ephemeris_payload()  # min_elevation is part of the payload
         return jsonify({'status': 'updated'})
     else:
         return jsonify({
@@ -165,15 +429,14 @@ def handle_config():
 @app.route('/api/satellites', methods=['POST'])
 def update_satellites():
     ensure_initialized()
-    global sat_config, my_sats, cached_ephemeris
     new_config = request.json
-    if config.save_sat_config(new_config):
-        sat_config = new_config
-        my_sats = tle.filter_satellites(all_sats, sat_config)
-        enrich_sats()
-        refresh_ephemeris()
-        return jsonify({'status': 'saved'})
-    return jsonify({'status': 'error'}), 500
+    # Serialized with TLE refreshes and shared-state reloads, which also swap the ephemeris
+    with _init_lock:
+        if not config.save_sat_config(new_config):
+            return jsonify({'status': 'error'}), 500
+        apply_sat_config(new_config)
+        remember_state_files(config.JSON_FILE)
+    return jsonify({'status': 'saved'})
 
 @app.route('/api/ephemeris')
 def get_ephemeris():
@@ -185,20 +448,66 @@ def get_ephemeris():
         center_time = parser.parse(center_time_str)
         if center_time.tzinfo is None: 
             center_time = center_time.replace(tzinfo=datetime.timezone.utc)
-        ephemeris = calculator.generate_ephemeris(my_sats, center_time, hours_radius=48, step_seconds=15)
+        
+        if request.args.get('async'):
+            # 200 with data if the window is ready, otherwise 202 + poll URL
+            if not window_jobs.in_range(window_jobs.quantize(center_time)):
+                return jsonify({'error': f'center_time must be within {EPHEMERIS_WINDOW_MAX_DAYS} days'}), 400
+            job = window_jobs.submit(center_time)
+            window_jobs.prefetch_neighbours(center_time, PREFETCH_DISTANCE_BUCKETS)
+            return ephemeris_job_response(job)
+        
+        ephemeris = calculator.generate_ephemeris(my_sats, center_time, hours_radius=EPHEMERIS_HOURS_RADIUS,
+                                                  step_seconds=EPHEMERIS_STEP_SECONDS)
         return jsonify({
             'center_time': center_time.isoformat(),
-            'ephemeris': ephemeris,
+            'ephemeris': ephemeris.to_points(),
             'satellites': sat_config,
             'min_elevation': config.MIN_ELEVATION
         })
     else:
-        return jsonify({
-            'center_time': cached_ephemeris_time.isoformat(),
-            'ephemeris': cached_ephemeris,
-            'satellites': sat_config,
-            'min_elevation': config.MIN_ELEVATION
-        })
+        return precompressed_response(get_ephemeris_payload())
+
+@app.route('/api/ephemeris/jobs/<job_id>')
+def get_ephemeris_job(job_id):
+    """Poll endpoint for async ephemeris windows."""
+    ensure_initialized()
+    # The id encodes the window, so any worker process can resolve it
+    center_time = window_jobs.center_time_for(job_id)
+    if center_time is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    return ephemeris_job_response(window_jobs.submit(center_time))
+
+def ephemeris_job_response(job):
+    if job['status'] == 'done':
+        return precompressed_response(job['result'])
+    if job['status'] == 'error':
+        return jsonify({'job_id': job['job_id'], 'status': 'error', 'error': job['error']}), 500
+    return jsonify({
+        'job_id': job['job_id'],
+        'status': job['status'],
+        'progress': job['progress'],
+        'center_time': job['center_time'].isoformat(),
+        'poll_url': url_for('get_ephemeris_job', job_id=job['job_id'])
+    }), 202
+
+def precompressed_response(payload):
+    """Serves a PrecompressedPayload with ETag revalidation and no per-request encoding."""
+    encoding, body = payload.select(request.accept_encodings)
+    
+    # Client already holds this version (in whichever coding it got it)
+    if any(request.if_none_match.contains(etag) for etag in payload.etags()):
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype='application/json')
+        if encoding:
+            # flask_compress skips responses that already carry an encoding
+            response.headers['Content-Encoding'] = encoding
+    
+    response.set_etag(payload.etag_for(encoding))
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Cache-Control'] = 'no-cache'  # Always revalidate via ETag
+    return response
 
 @app.route('/api/passes')
 def get_passes():
@@ -213,6 +522,36 @@ def get_passes():
     passes = calculator.compute_passes(my_sats, start_time, 24)
     return jsonify(passes)
 
+@app.route('/api/close_approaches')
+def get_close_approaches():
+    """Catalog objects coming within threshold_km of a tracked satellite in the next N hours."""
+    ensure_initialized()
+    try:
+        threshold_km = float(request.args.get('threshold_km', 50))
+        hours = float(request.args.get('hours', 24))
+    except ValueError:
+        return jsonify({'error': 'Invalid parameters'}), 400
+    if not (0 < threshold_km <= 500) or not (0 < hours <= 72):
+        return jsonify({'error': 'threshold_km must be in (0, 500], hours in (0, 72]'}), 400
+    
+    time_str = request.args.get('time')
+    if time_str:
+        start_time = parser.parse(time_str)
+        if start_time.tzinfo is None: start_time = start_time.replace(tzinfo=datetime.timezone.utc)
+    else:
+        start_time = datetime.datetime.now(datetime.timezone.utc)
+    
+    started = time.time()
+    approaches = close_approach.find_close_approaches(all_sats, list(my_sats), start_time,
+                                                      hours=hours, threshold_km=threshold_km)
+    print(f"Close-approach search: {len(approaches)} approaches in {time.time() - started:.1f}s")
+    return jsonify({
+        'start_time': start_time.isoformat(),
+        'hours': hours,
+        'threshold_km': threshold_km,
+        'approaches': approaches
+    })
+
 @app.route('/api/polar')
 def get_polar_data():
     """Returns Az/El data points for polar plot visualization."""
@@ -272,19 +611,12 @@ def search_satellites():
         return jsonify([])
     
     results = []
-    for sat in all_sats:
-        name = sat.name.lower()
-        norad = str(sat.model.satnum)
-        
-        if query in name or query in norad:
-            results.append({
-                'norad_id': norad,
-                'name': sat.name,
-                'already_tracked': norad in sat_config
-            })
-        
-        if len(results) >= 20:
-            break
+    for norad, name in all_sats.search(query, limit=20):
+        results.append({
+            'norad_id': str(norad),
+            'name': name,
+            'already_tracked': str(norad) in sat_config
+        })
     
     return jsonify(results)
 
@@ -303,7 +635,12 @@ def record_satellite():
         return jsonify({'success': False, 'message': 'Satellite config not found'}), 404
         
     sat_data = sat_config[sat_id]
-    duration = data.get('duration')
+    duration = data.get('duration') or 0
+    if not isinstance(duration, (int, float)) or isinstance(duration, bool):
+        return jsonify({'success': False, 'message': 'Invalid duration'}), 400
+    if not (0 <= duration <= calculations.MAX_DOPPLER_WINDOW_SECONDS):
+        return jsonify({'success': False, 'message': f'Duration must be between 0 and '
+                        f'{calculations.MAX_DOPPLER_WINDOW_SECONDS} seconds'}), 400
     
     # Check if Webhook is configured
     webhook_url = app_settings.get('webhook_url')
@@ -319,38 +656,114 @@ def record_satellite():
         job_id = f"rec_{sat_id}_{start_ts_ms}"
         
         # Check if job exists -> Cancel
-        if scheduler.get_job(job_id):
-            scheduler.remove_job(job_id)
-            if job_id in scheduled_jobs:
-                del scheduled_jobs[job_id]
+        if job_store.update_jobs(lambda jobs: jobs.pop(job_id, None) is not None):
+            job_store.delete_doppler(job_id)
+            if _is_leader:
+                sync_scheduled_jobs()
             print(f"Cancelled recording job {job_id}")
             return jsonify({'success': True, 'message': 'Recording cancelled', 'status': 'cancelled', 'job_id': job_id})
         
         # Schedule new job
         now = datetime.datetime.now(datetime.timezone.utc)
         if start_time > now:
-            scheduler.add_job(
-                execute_recording, 
-                'date', 
-                run_date=start_time, 
-                args=[webhook_url, sat_data, duration, sat_id],
-                id=job_id
-            )
-            scheduled_jobs[job_id] = {
+            job_info = {
                 'sat_id': sat_id,
                 'start_time': start_ts_ms,
                 'end_time': start_ts_ms + (duration * 1000),  # Store end time for conflict detection
                 'duration': duration,
-                'sat_name': sat_data.get('name')
+                'sat_name': sat_data.get('name'),
+                'webhook_url': webhook_url,
+                'sat_data': sat_data
             }
+            doppler = compute_pass_doppler(sat_id, sat_data, start_time, duration)
+            if doppler:
+                job_store.save_doppler(job_id, doppler)  # Stored before the job becomes visible
+            job_store.update_jobs(lambda jobs: jobs.update({job_id: job_info}))
+            # The leader schedules it right away; otherwise its next sync picks it up
+            if _is_leader:
+                sync_scheduled_jobs()
             print(f"Scheduled recording {job_id} for {start_time}")
             return jsonify({'success': True, 'message': f'Scheduled for {start_time.strftime("%H:%M:%S")}', 'status': 'scheduled', 'job_id': job_id})
             
     # Immediate execution fallback
-    execute_recording(webhook_url, sat_data, duration, sat_id)
+    now = datetime.datetime.now(datetime.timezone.utc)
+    doppler = compute_pass_doppler(sat_id, sat_data, now, duration)
+    execute_recording(webhook_url, sat_data, duration, sat_id, doppler)
     return jsonify({'success': True, 'message': 'Recording started immediately', 'status': 'started'})
 
-def execute_recording(webhook_url, sat_data, duration, sat_id):
+def find_tracked_sat(sat_id):
+    for s in my_sats:
+        if str(s.model.satnum) == str(sat_id):
+            return s
+    return None
+
+def compute_pass_doppler(sat_id, sat_data, start_time, duration):
+    """Doppler curve for a recording window, or None if the frequency/satellite is unknown."""
+    freq_hz = calculations.parse_frequency_hz(sat_data.get('frequency'))
+    sat = find_tracked_sat(sat_id)
+    if freq_hz <= 0 or sat is None or not duration:
+        return None
+    
+    # Callers validate duration against calculations.MAX_DOPPLER_WINDOW_SECONDS
+    end_time = start_time + datetime.timedelta(seconds=float(duration))
+    return calculator.compute_doppler_curve(sat, start_time, end_time, freq_hz)
+
+RECORDING_MISFIRE_GRACE_SECONDS = 30
+
+def sync_scheduled_jobs():
+    """
+    Mirrors the shared job file into the leader's scheduler.
+    Jobs that reached the leader late (scheduled through another worker just
+    before their start) still run if within the misfire grace window.
+    """
+    now = datetime.datetime.now(datetime.timezone.utc)
+    expired_before_ms = (now.timestamp() - RECORDING_MISFIRE_GRACE_SECONDS) * 1000
+    
+    def drop_expired(jobs):
+        # Decided under the job file lock: a job the scheduler just fired stays
+        # in the file until run_scheduled_recording claims it
+        expired = [job_id for job_id, job_info in jobs.items() if job_info['start_time'] < expired_before_ms]
+        for job_id in expired:
+            del jobs[job_id]
+        return expired, dict(jobs)
+    
+    expired, jobs = job_store.update_jobs(drop_expired)
+    for job_id in expired:
+        job_store.delete_doppler(job_id)
+    if expired:
+        print(f"Dropped {len(expired)} missed recording job(s)")
+    
+    for job in scheduler.get_jobs():
+        if job.id.startswith('rec_') and job.id not in jobs:
+            scheduler.remove_job(job.id)
+    
+    for job_id, job_info in jobs.items():
+        if scheduler.get_job(job_id):
+            continue
+        # Due but within the grace window: run now. If it already fired and is
+        # only waiting to be claimed, the claim makes this second run a no-op.
+        start_time = datetime.datetime.fromtimestamp(job_info['start_time'] / 1000.0, tz=datetime.timezone.utc)
+        scheduler.add_job(
+            run_scheduled_recording,
+            'date',
+            run_date=max(start_time, now),
+            args=[job_id],
+            id=job_id,
+            replace_existing=True,  # Request threads and the sync job may race here
+            misfire_grace_time=RECORDING_MISFIRE_GRACE_SECONDS
+        )
+
+def run_scheduled_recording(job_id):
+    # Claim the job before firing so it can never be sent twice
+    job_info = job_store.update_jobs(lambda jobs: jobs.pop(job_id, None))
+    if not job_info:
+        return
+    doppler = job_store.load_doppler(job_id)
+    job_store.delete_doppler(job_id)
+    execute_recording(job_info['webhook_url'], job_info['sat_data'], job_info['duration'],
+                      job_info['sat_id'], doppler)
+
+def execute_recording(webhook_url, sat_data, duration, sat_id, doppler=None):
     mgr = webhook_manager.WebhookManager()
     
     name = sat_data.get('name', 'Unknown')
@@ -373,6 +786,8 @@ def execute_recording(webhook_url, sat_data, duration, sat_id):
         'timestamp': timestamp,
         'filename': filename
     }
+    if doppler:
+        payload['doppler'] = doppler
         
     print(f"Executing webhook for {name}")
     success, msg = mgr.send_webhook(webhook_url, payload)
@@ -382,8 +797,9 @@ def execute_recording(webhook_url, sat_data, duration, sat_id):
 def get_scheduled_jobs():
     """Returns list of currently scheduled jobs with time ranges for conflict detection."""
     jobs = []
-    for job_id, job_info in scheduled_jobs.items():
-        if scheduler.get_job(job_id):  # Only include jobs that are still scheduled
+    now_ms = time.time() * 1000
+    for job_id, job_info in job_store.load_jobs().items():
+        if job_info.get('start_time', 0) > now_ms:  # Only include jobs that are still scheduled
             jobs.append({
                 'job_id': job_id,
                 'sat_id': job_info.get('sat_id'),
@@ -394,6 +810,46 @@ def get_scheduled_jobs():
             })
     return jsonify({'jobs': jobs})
 
+@app.route('/api/doppler')
+def get_doppler():
+    """Returns the Doppler curve for a pass (cached if the pass is scheduled)."""
+    ensure_initialized()
+    sat_id = request.args.get('sat_id')
+    start_ts = request.args.get('start')
+    end_ts = request.args.get('end')
+    
+    if not all([sat_id, start_ts, end_ts]):
+        return jsonify({'error': 'Missing parameters'}), 400
+    
+    try:
+        start_ms, end_ms = float(start_ts), float(end_ts)
+        if not (math.isfinite(start_ms) and math.isfinite(end_ms)):
+            raise ValueError
+    except ValueError:
+        return jsonify({'error': 'start and end must be Unix timestamps in ms'}), 400
+    duration = (end_ms - start_ms) / 1000
+    if duration <= 0:
+        return jsonify({'error': 'end must be after start'}), 400
+    if duration > calculations.MAX_DOPPLER_WINDOW_SECONDS:
+        return jsonify({'error': f'Window exceeds {calculations.MAX_DOPPLER_WINDOW_SECONDS // 3600} hours'}), 400
+    
+    # Scheduled pass: serve its stored curve if the window is the same
+    job_id = f"rec_{sat_id}_{start_ts}"
+    job_info = job_store.load_jobs().get(job_id)
+    if job_info and float(job_info['end_time']) == end_ms:
+        doppler = job_store.load_doppler(job_id)
+        if doppler:
+            return jsonify(doppler)
+    
+    if sat_id not in sat_config or not find_tracked_sat(sat_id):
+        return jsonify({'error': 'Satellite not found'}), 404
+    
+    start_time = datetime.datetime.fromtimestamp(start_ms/1000, tz=datetime.timezone.utc)
+    doppler = compute_pass_doppler(sat_id, sat_config[sat_id], start_time, duration)
+    if not doppler:
+        return jsonify({'error': 'No downlink frequency configured'}), 400
+    return jsonify(doppler)
+
 @app.route('/api/test_webhook', methods=['POST'])
 def test_webhook():
     """Test Webhook connection with provided URL."""
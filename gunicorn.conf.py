@@ -0,0 +1,31 @@
+# Production server: gunicorn -c gunicorn.conf.py app:app
+#
+# TLEs, the calculator and the ephemeris are loaded once in the master process
+# (preload_app) and shared copy-on-write with the forked workers. Exactly one
+# worker wins the leader lock and runs the recording scheduler + TLE refresh.
+import gc
+import os
+import multiprocessing
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+workers = int(os.environ.get('SATTRACK_WORKERS', multiprocessing.cpu_count()))
+worker_class = 'gthread'
+threads = int(os.environ.get('SATTRACK_THREADS', 4))
+timeout = 120  # center_time ephemeris requests can take a while
+preload_app = True
+
+
+def when_ready(server):
+    import app as sattrack_app
+    server.log.info("Preloading satellite data in master process...")
+    sattrack_app.ensure_initialized(start_services=False)
+    sattrack_app.get_ephemeris_payload()
+
+    # Keep the preloaded objects out of GC passes so workers don't touch
+    # (and thereby copy) the shared pages
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    import app as sattrack_app
+    sattrack_app.start_background_services()
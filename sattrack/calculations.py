@@ -1,7 +1,13 @@
 import math
 import datetime
+import numpy as np
 from skyfield.api import Topos, load, wgs84
 from . import config
+from .ephemeris import Ephemeris
+
+SPEED_OF_LIGHT_KM_S = 299792.458
+# Longest Doppler window (1 s samples); a pass is minutes, a recording at most hours
+MAX_DOPPLER_WINDOW_SECONDS = 6 * 3600
 
 def degrees_to_cardinal(d):
     """Converts azimuth degrees to cardinal direction string."""
@@ -10,6 +16,27 @@ def degrees_to_cardinal(d):
     ix = int((d + 11.25)/22.5)
     return dirs[ix % 16]
 
+def parse_frequency_hz(freq):
+    """Parses config frequencies like '145.825M', '137.5 MHz' or '2400k' into Hz."""
+    if freq is None:
+        return 0.0
+    if isinstance(freq, (int, float)):
+        return float(freq)
+    
+    s = str(freq).strip().upper().replace(' ', '')
+    if s.endswith('HZ'):
+        s = s[:-2]
+    
+    multipliers = {'K': 1e3, 'M': 1e6, 'G': 1e9}
+    factor = 1.0
+    if s and s[-1] in multipliers:
+        factor = multipliers[s[-1]]
+        s = s[:-1]
+    try:
+        return float(s) * factor
+    except ValueError:
+        return 0.0
+
 class OrbitCalculator:
     def __init__(self):
         self.ts = load.timescale()
@@ -142,10 +169,12 @@ class OrbitCalculator:
         c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
         return R * c
 
-    def generate_ephemeris(self, satellites, center_time_utc, hours_radius=24, step_seconds=60):
+    def ephemeris_grid(self, center_time_utc, hours_radius=24, step_seconds=60):
         """
-        Generates dense position data for interpolation.
-        Now includes altitude for elevation calculation.
+        Evenly spaced Time vector for an ephemeris window.
+        Skyfield caches Earth-rotation terms on the Time object, which dominate
+        propagation cost - keep the grid of a long-lived window and pass it back
+        to generate_ephemeris to make adding satellites cheap.
         """
         t0 = self.ts.from_datetime(center_time_utc - datetime.timedelta(hours=hours_radius))
         
@@ -153,30 +182,68 @@ class OrbitCalculator:
         total_seconds = (hours_radius * 2) * 3600
         steps = int(total_seconds / step_seconds)
         
-        times = self.ts.tt_jd([t0.tt + i * (step_seconds / 86400.0) for i in range(steps)])
+        return self.ts.tt_jd(t0.tt + np.arange(steps) * (step_seconds / 86400.0))
+
+    @staticmethod
+    def unix_seconds(times):
+        """Timestamps as Unix (seconds) for easier JS parsing: Unix = (JD - 2440587.5) * 86400"""
+        return (times.tt - 2440587.5) * 86400.0
+
+    def generate_ephemeris(self, satellites, center_time_utc, hours_radius=24, step_seconds=60, progress=None,
+                           times=None):
+        """
+        Generates dense position data for interpolation.
+        Now includes altitude for elevation calculation.
+        Optional progress(done, total) is called after each satellite.
+        `times` is a grid from ephemeris_grid() for the same window, to reuse its caches.
+        Returns: Ephemeris (NumPy arrays on a shared time axis).
+        """
+        if times is None:
+            times = self.ephemeris_grid(center_time_utc, hours_radius, step_seconds)
         
-        # Prepare result dict
-        ephemeris = {}
+        ephemeris = Ephemeris(self.unix_seconds(times))
         
-        for sat in satellites:
-            sat_id = sat.model.satnum
+        for i, sat in enumerate(satellites):
             geocentric = sat.at(times)
             lat, lon = wgs84.latlon_of(geocentric)
             alt = wgs84.height_of(geocentric)  # Altitude in km
+            ephemeris.add(sat.model.satnum, lat.degrees, lon.degrees, alt.km)
             
-            # Pack data: [ts, lat, lon, alt_km]
-            # Timestamps as Unix (seconds) for easier JS parsing
-            # Unix = (JD - 2440587.5) * 86400
-            
-            points = []
-            for i in range(len(times)):
-                unixts = (times[i].tt - 2440587.5) * 86400.0
-                pts_lat = lat.degrees[i]
-                pts_lon = lon.degrees[i]
-                pts_alt = alt.km[i]
-                if not (math.isnan(pts_lat)):
-                    points.append([unixts, round(pts_lat,4), round(pts_lon,4), round(pts_alt, 1)])
-            
-            ephemeris[sat_id] = points
+            if progress:
+                progress(i + 1, len(satellites))
 
         return ephemeris
+
+    def compute_doppler_curve(self, sat, start_time_utc, end_time_utc, frequency_hz, step_seconds=1):
+        """
+        Range-rate and Doppler-shifted downlink frequency over a pass window.
+        All samples are propagated in one vectorized call.
+        Raises ValueError for empty windows or ones over MAX_DOPPLER_WINDOW_SECONDS.
+        """
+        total_seconds = (end_time_utc - start_time_utc).total_seconds()
+        if total_seconds <= 0:
+            raise ValueError("Doppler window end must be after its start")
+        if total_seconds > MAX_DOPPLER_WINDOW_SECONDS:
+            raise ValueError(f"Doppler window exceeds {MAX_DOPPLER_WINDOW_SECONDS // 3600} hours")
+        steps = int(total_seconds / step_seconds) + 1
+        
+        t0 = self.ts.from_datetime(start_time_utc)
+        times = self.ts.tt_jd(t0.tt + np.arange(steps) * (step_seconds / 86400.0))
+        
+        # Range rate = projection of relative velocity onto line of sight
+        topocentric = (sat - self.observer).at(times)
+        pos = topocentric.position.km
+        vel = topocentric.velocity.km_per_s
+        range_km = np.linalg.norm(pos, axis=0)
+        range_rate = np.einsum('ij,ij->j', pos, vel) / range_km
+        
+        # Positive range rate = receding = lower received frequency
+        shifted = frequency_hz * (1.0 - range_rate / SPEED_OF_LIGHT_KM_S)
+        
+        return {
+            'start_ts': start_time_utc.timestamp(),
+            'step_seconds': step_seconds,
+            'base_freq_hz': int(round(frequency_hz)),
+            'range_rate_km_s': np.round(range_rate, 4).tolist(),
+            'freq_hz': np.rint(shifted).astype(int).tolist()
+        }
@@ -0,0 +1,233 @@
+import datetime
+import numpy as np
+from sgp4.api import SatrecArray
+
+# Coarse screening step. Between two samples a pair can close in by at most
+# half a step at the maximum relative speed (head-on LEO ~15 km/s).
+DEFAULT_STEP_SECONDS = 60
+MAX_RELATIVE_SPEED_KM_S = 15.5
+TIME_CHUNK_STEPS = 60  # Coarse steps propagated per catalog batch (~15 MB for 10k objects)
+# Mean-element perigee/apogee differ from the true radius by J2 short-period terms
+APOGEE_PERIGEE_PAD_KM = 50.0
+# Linear relative motion is accurate to well under a km within one coarse step
+REFINE_MARGIN_KM = 2.0
+REFINE_MAX_SHIFTS = 2
+
+_CELL_BITS = 16
+_CELL_OFFSET = 1 << (_CELL_BITS - 1)
+_CELL_MAX = (1 << _CELL_BITS) - 1
+_NEIGHBOUR_OFFSETS = np.array([(dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)])
+
+
+def _julian_dates(start_time_utc, offsets_seconds):
+    """(jd, fr) arrays for sgp4, split to keep sub-millisecond precision."""
+    jd0 = 2440587.5 + start_time_utc.timestamp() / 86400.0
+    whole = np.floor(jd0)
+    fr = (jd0 - whole) + np.asarray(offsets_seconds, dtype=float) / 86400.0
+    return np.full_like(fr, whole), fr
+
+
+def _cell_keys(cells, step_idx):
+    """
+    Packs (time step, grid cell) into one sortable int64.
+    Cells far outside the grid are clamped - that only adds false candidates,
+    which the miss-distance check removes.
+    """
+    cells = np.clip(cells + _CELL_OFFSET, 0, _CELL_MAX)
+    key = step_idx.astype(np.int64)
+    for axis in range(3):
+        key = (key << _CELL_BITS) | cells[..., axis]
+    return key
+
+
+def _altitude_prefilter(catalog, targets, threshold_km):
+    """
+    Catalog rows whose perigee-apogee band overlaps any target's.
+    Objects in disjoint shells can never come close, so they are not propagated.
+    """
+    pad = threshold_km + APOGEE_PERIGEE_PAD_KM
+    bands = catalog.altitude_bands_km()
+    keep = np.zeros(len(catalog), dtype=bool)
+    for target in targets:
+        model = target.model
+        perigee, apogee = model.altp * model.radiusearthkm, model.alta * model.radiusearthkm
+        keep |= (bands[:, 0] - pad <= apogee) & (bands[:, 1] + pad >= perigee)
+    return np.flatnonzero(keep)
+
+
+def _screen_chunk(r_cat, v_cat, valid_cat, r_tgt, v_tgt, valid_tgt, cell_km, max_miss_km, step_seconds):
+    """
+    Grid-hash candidate search for one batch of time steps.
+    r_cat: (N, S, 3), r_tgt: (T, S, 3) positions in km (v_* in km/s).
+    Candidates found in neighbouring cells are kept only if their linearly
+    extrapolated miss distance within ±one step is below max_miss_km.
+    Returns: (target_idx, object_idx, step_idx, estimated_miss_km) arrays.
+    """
+    obj_idx, obj_step = np.nonzero(valid_cat)
+    obj_cells = np.floor(r_cat[obj_idx, obj_step] / cell_km).astype(np.int64)
+    obj_keys = _cell_keys(obj_cells, obj_step)
+    order = np.argsort(obj_keys)
+    sorted_keys = obj_keys[order]
+
+    tgt_idx, tgt_step = np.nonzero(valid_tgt)
+    tgt_cells = np.floor(r_tgt[tgt_idx, tgt_step] / cell_km).astype(np.int64)
+    query_keys = _cell_keys(tgt_cells[:, None, :] + _NEIGHBOUR_OFFSETS[None, :, :], tgt_step[:, None]).ravel()
+
+    lo = np.searchsorted(sorted_keys, query_keys, side='left')
+    hi = np.searchsorted(sorted_keys, query_keys, side='right')
+    counts = hi - lo
+    total = int(counts.sum())
+    empty = np.empty(0, dtype=np.int64)
+    if total == 0:
+        return empty, empty, empty, np.empty(0)
+
+    # Expand every query's [lo, hi) range into flat candidate lists
+    query = np.repeat(np.arange(len(query_keys)), counts)
+    within = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    match = order[np.repeat(lo, counts) + within]
+
+    t = tgt_idx[query // len(_NEIGHBOUR_OFFSETS)]
+    s = tgt_step[query // len(_NEIGHBOUR_OFFSETS)]
+    o = obj_idx[match]
+    
+    # Closest point of the straight-line relative motion, clamped to ±one step
+    dr = r_cat[o, s] - r_tgt[t, s]
+    dv = v_cat[o, s] - v_tgt[t, s]
+    dv2 = np.maximum(np.einsum('ij,ij->i', dv, dv), 1e-12)
+    t_min = np.clip(-np.einsum('ij,ij->i', dr, dv) / dv2, -step_seconds, step_seconds)
+    miss = np.linalg.norm(dr + dv * t_min[:, None], axis=1)
+
+    keep = miss < max_miss_km
+    return t[keep], o[keep], s[keep], miss[keep]
+
+
+def _refine_encounter(target, obj, start_time_utc, center_seconds, step_seconds, horizon_seconds):
+    """
+    Time of closest approach around a coarse minimum: 1 s sampling over
+    ±one coarse step (clipped to the search window), then a parabola through
+    the best three samples. If the pair is still closing at the edge of that
+    span, the span follows it (REFINE_MAX_SHIFTS times).
+    Returns: (seconds_from_start, distance_km, relative_speed_km_s) or None if
+    no minimum inside the search window was found.
+    """
+    for _ in range(REFINE_MAX_SHIFTS + 1):
+        offsets = center_seconds + np.arange(-step_seconds, step_seconds + 1, 1.0)
+        offsets = offsets[(offsets >= 0) & (offsets <= horizon_seconds)]
+        jd, fr = _julian_dates(start_time_utc, offsets)
+        e1, r1, v1 = target.sgp4_array(jd, fr)
+        e2, r2, v2 = obj.sgp4_array(jd, fr)
+
+        dist = np.linalg.norm(r1 - r2, axis=1)
+        dist[(e1 != 0) | (e2 != 0)] = np.nan
+        if np.all(np.isnan(dist)):
+            return None
+        i = int(np.nanargmin(dist))
+
+        # A minimum on the edge of the span is only real at the search window's edges
+        if not ((i == 0 and offsets[0] > 0) or (i == len(dist) - 1 and offsets[-1] < horizon_seconds)):
+            break
+        center_seconds = offsets[i]
+    else:
+        return None
+
+    t_best, d_best = offsets[i], dist[i]
+    if 0 < i < len(dist) - 1 and not np.isnan(dist[i - 1]) and not np.isnan(dist[i + 1]):
+        denom = dist[i - 1] - 2 * dist[i] + dist[i + 1]
+        if denom > 0:
+            shift = 0.5 * (dist[i - 1] - dist[i + 1]) / denom
+            t_best = offsets[i] + shift
+            d_best = dist[i] - 0.25 * (dist[i - 1] - dist[i + 1]) * shift
+
+    rel_speed = np.linalg.norm(v1[i] - v2[i])
+    return float(t_best), float(max(d_best, 0.0)), float(rel_speed)
+
+
+def find_close_approaches(catalog, targets, start_time_utc, hours=24, threshold_km=10.0,
+                          step_seconds=DEFAULT_STEP_SECONDS):
+    """
+    Finds objects of a tle.SatelliteCatalog passing within threshold_km of any
+    target satellite (EarthSatellite list).
+    Objects in non-overlapping altitude shells are skipped, the rest of the
+    catalog is propagated in time batches (TEME frame - distances are the same
+    as in ECEF), candidate pairs come from a spatial grid hash per coarse step,
+    and only those pairs are refined to the time of closest approach.
+    Returns: list of approach dicts sorted by time of closest approach.
+    """
+    if not len(catalog) or not targets:
+        return []
+
+    rows = _altitude_prefilter(catalog, targets, threshold_km)
+    if not len(rows):
+        return []
+
+    # Plain Satrecs, built just for this run - no EarthSatellite per catalog object
+    catalog_satrecs = [catalog.satrec(i) for i in rows]
+    catalog_models = SatrecArray(catalog_satrecs)
+    target_models = SatrecArray([sat.model for sat in targets])
+    catalog_ids = catalog.norad_ids[rows].tolist()
+    catalog_names = catalog.names[rows]
+    target_ids = [sat.model.satnum for sat in targets]
+    target_id_set = set(target_ids)
+
+    cell_km = threshold_km + MAX_RELATIVE_SPEED_KM_S * step_seconds / 2.0
+    horizon_seconds = hours * 3600
+    total_steps = int(horizon_seconds / step_seconds) + 1
+
+    found = []
+    for chunk_start in range(0, total_steps, TIME_CHUNK_STEPS):
+        steps = np.arange(chunk_start, min(chunk_start + TIME_CHUNK_STEPS, total_steps))
+        jd, fr = _julian_dates(start_time_utc, steps * step_seconds)
+
+        e_cat, r_cat, v_cat = catalog_models.sgp4(jd, fr)
+        e_tgt, r_tgt, v_tgt = target_models.sgp4(jd, fr)
+        valid_cat = (e_cat == 0) & np.isfinite(r_cat).all(axis=2)
+        valid_tgt = (e_tgt == 0) & np.isfinite(r_tgt).all(axis=2)
+
+        t, o, s, d = _screen_chunk(r_cat, v_cat, valid_cat, r_tgt, v_tgt, valid_tgt,
+                                   cell_km, threshold_km + REFINE_MARGIN_KM, step_seconds)
+        found.append((t, o, s + chunk_start, d))
+
+    t = np.concatenate([f[0] for f in found])
+    o = np.concatenate([f[1] for f in found])
+    s = np.concatenate([f[2] for f in found])
+    d = np.concatenate([f[3] for f in found])
+    if len(t) == 0:
+        return []
+
+    # Group candidates into encounters: same pair, consecutive coarse steps
+    order = np.lexsort((s, o, t))
+    t, o, s, d = t[order], o[order], s[order], d[order]
+    new_run = np.ones(len(t), dtype=bool)
+    new_run[1:] = (t[1:] != t[:-1]) | (o[1:] != o[:-1]) | (s[1:] - s[:-1] > 1)
+    run_starts = np.flatnonzero(new_run)
+    run_ends = np.append(run_starts[1:], len(t))
+
+    approaches = []
+    for a, b in zip(run_starts, run_ends):
+        target, obj = targets[t[a]], catalog_satrecs[o[a]]
+        target_id, obj_id = target_ids[t[a]], catalog_ids[o[a]]
+        if obj_id == target_id:
+            continue
+        if obj_id in target_id_set and obj_id < target_id:
+            continue  # Tracked-vs-tracked pair, already reported the other way round
+
+        best = a + int(np.argmin(d[a:b]))
+        refined = _refine_encounter(target.model, obj, start_time_utc,
+                                    float(s[best] * step_seconds), step_seconds, horizon_seconds)
+        if refined is None or refined[1] >= threshold_km:
+            continue
+
+        tca_seconds, distance_km, rel_speed = refined
+        tca = start_time_utc + datetime.timedelta(seconds=tca_seconds)
+        approaches.append({
+            'sat_id': target_id,
+            'name': target.name,
+            'object_id': obj_id,
+            'object_name': str(catalog_names[o[a]]),
+            'tca_iso': tca.isoformat(),
+            'distance_km': round(distance_km, 2),
+            'relative_speed_km_s': round(rel_speed, 3)
+        })
+
+    approaches.sort(key=lambda x: x['tca_iso'])
+    return approaches
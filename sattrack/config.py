@@ -34,6 +34,12 @@ def save_sat_config(data, filepath=JSON_FILE):
     except Exception:
         return False
 SETTINGS_FILE = 'data/settings.json'
+SCHEDULED_JOBS_FILE = 'data/scheduled_jobs.json'
+DOPPLER_DIR = 'data/doppler'  # One curve file per scheduled job
+LEADER_LOCK_FILE = 'data/.leader.lock'
+EPHEMERIS_STATE_FILE = 'data/ephemeris_state.json'
+EPHEMERIS_TRACKS_DIR = 'data/ephemeris'  # Published default ephemeris, one subdirectory per center
+EPHEMERIS_WINDOW_DIR = 'data/ephemeris_windows'
 
 def load_settings(filepath=SETTINGS_FILE):
     try:
@@ -52,3 +58,24 @@ def save_settings(data, filepath=SETTINGS_FILE):
         return True
     except Exception:
         return False
+
+def load_ephemeris_state(filepath=EPHEMERIS_STATE_FILE):
+    try:
+        if not os.path.exists(filepath):
+            return {}
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        print(Fore.RED + f"Error loading ephemeris state: {e}")
+        return {}
+
+def save_ephemeris_state(data, filepath=EPHEMERIS_STATE_FILE):
+    # Atomic replace: other worker processes read it without locking
+    try:
+        tmp_path = filepath + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=4)
+        os.replace(tmp_path, filepath)
+        return True
+    except Exception:
+        return False
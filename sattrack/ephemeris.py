@@ -0,0 +1,94 @@
+import os
+import numpy as np
+
+
+class Ephemeris:
+    """
+    Ephemeris of several satellites on one shared time axis.
+    `times` holds Unix seconds; each track is an (N, 3) float64 array of
+    [lat, lon, alt_km], NaN where SGP4 failed (e.g. decayed). JSON-style
+    point lists are only produced at the edges via to_points().
+    """
+
+    def __init__(self, times):
+        self.times = np.asarray(times, dtype=np.float64)
+        self.tracks = {}  # sat_id -> (N, 3) float64
+
+    def add(self, sat_id, lat_deg, lon_deg, alt_km):
+        self.tracks[sat_id] = np.column_stack((lat_deg, lon_deg, alt_km)).astype(np.float64)
+
+    def __len__(self):
+        return len(self.tracks)
+
+    def __contains__(self, sat_id):
+        return sat_id in self.tracks
+
+    def keys(self):
+        return self.tracks.keys()
+
+    def save(self, directory):
+        """
+        Writes times, ids and stacked (S, N, 3) tracks as .npy files. The
+        directory is built next to its final path and renamed into place, so
+        readers never see a partial one; an existing directory is kept as is.
+        """
+        if os.path.isdir(directory):
+            return
+        tmp_dir = f"{directory}.{os.getpid()}.tmp"
+        os.makedirs(tmp_dir, exist_ok=True)
+        ids = np.array(list(self.tracks.keys()), dtype=np.int64)
+        stacked = np.stack(list(self.tracks.values())) if self.tracks else np.empty((0, len(self.times), 3))
+        np.save(os.path.join(tmp_dir, 'times.npy'), self.times)
+        np.save(os.path.join(tmp_dir, 'ids.npy'), ids)
+        np.save(os.path.join(tmp_dir, 'tracks.npy'), stacked)
+        os.rename(tmp_dir, directory)
+
+    @classmethod
+    def load(cls, directory):
+        """
+        Ephemeris written by save(), or None if unavailable. Tracks are
+        read-only views of one memory-mapped array, so processes loading the
+        same files share its pages.
+        """
+        try:
+            times = np.load(os.path.join(directory, 'times.npy'))
+            ids = np.load(os.path.join(directory, 'ids.npy'))
+            stacked = np.load(os.path.join(directory, 'tracks.npy'), mmap_mode='r')
+        except (OSError, ValueError):
+            return None
+        result = cls(times)
+        result.tracks = {int(sat_id): stacked[i] for i, sat_id in enumerate(ids)}
+        return result
+
+    def subset(self, sat_ids):
+        """Satellites in sat_ids only; shares the time axis and track arrays (no copy)."""
+        result = Ephemeris(self.times)
+        result.tracks = {sid: track for sid, track in self.tracks.items() if sid in sat_ids}
+        return result
+
+    def merged(self, other):
+        """Union of two ephemerides computed on the same time axis."""
+        if not np.array_equal(self.times, other.times):
+            raise ValueError("Cannot merge ephemerides with different time axes")
+        result = Ephemeris(self.times)
+        result.tracks = {**self.tracks, **other.tracks}
+        return result
+
+    def nbytes(self):
+        return self.times.nbytes + sum(track.nbytes for track in self.tracks.values())
+
+    def to_points(self):
+        """
+        Client format: {sat_id: [[unix_ts, lat, lon, alt_km], ...]},
+        lat/lon rounded to 4 and altitude to 1 decimal, NaN rows dropped.
+        """
+        points = {}
+        for sat_id, track in self.tracks.items():
+            packed = np.column_stack((
+                self.times,
+                np.round(track[:, 0], 4),
+                np.round(track[:, 1], 4),
+                np.round(track[:, 2], 1)
+            ))
+            points[sat_id] = packed[~np.isnan(packed[:, 1])].tolist()
+        return points
@@ -0,0 +1,258 @@
+import datetime
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from colorama import Fore
+from .payload_cache import PrecompressedPayload
+
+try:
+    import fcntl
+except ImportError:  # Windows: only the single-process dev server is supported
+    fcntl = None
+
+LOCK_POLL_SECONDS = 0.25
+STALE_LOCK_SECONDS = 3600  # Lock files of windows not stored (or touched) for this long are pruned
+
+
+class EphemerisJobManager:
+    """
+    Computes ephemeris windows in a small background pool.
+    Jobs are keyed by their (quantized) center time, so repeated requests,
+    prefetches and polls for the same window all share one computation.
+    Finished windows are stored in store_dir, keyed by window and data
+    version, and a per-window file lock lets only one worker process compute
+    a window - the others wait for its result and read it from disk.
+    """
+
+    def __init__(self, compute, bucket_seconds, store_dir, version, reference_time, max_distance_seconds,
+                 max_workers=2, max_windows=6, max_pending=4, max_stored=8):
+        # compute(center_time, progress_cb) -> PrecompressedPayload served to clients
+        # version() -> str that changes whenever the window content would
+        # reference_time() -> datetime; windows further than max_distance_seconds away are refused
+        self._compute = compute
+        self._version = version
+        self._reference_time = reference_time
+        self.max_distance_seconds = max_distance_seconds
+        self.bucket_seconds = bucket_seconds
+        self.store_dir = store_dir
+        self.max_windows = max_windows
+        self.max_pending = max_pending
+        self.max_stored = max_stored
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='ephemeris')
+        self._lock = threading.Lock()
+        self._jobs = OrderedDict()  # storage key -> job dict, oldest first
+
+    # ---------- ids ----------
+    def quantize(self, center_time):
+        """Snaps a center time to the bucket grid so neighbouring requests share windows."""
+        ts = center_time.timestamp()
+        bucket_ts = round(ts / self.bucket_seconds) * self.bucket_seconds
+        return datetime.datetime.fromtimestamp(bucket_ts, tz=datetime.timezone.utc)
+
+    def job_id_for(self, center_time):
+        return f"w{int(self.quantize(center_time).timestamp())}"
+
+    def center_time_for(self, job_id):
+        """Inverse of job_id_for; returns None for ids this manager never hands out."""
+        if not job_id.startswith('w') or not job_id[1:].isdigit():
+            return None
+        ts = int(job_id[1:])
+        if ts % self.bucket_seconds:
+            return None
+        try:
+            center = datetime.datetime.fromtimestamp(ts, tz=datetime.timezone.utc)
+        except (ValueError, OverflowError, OSError):
+            return None
+        return center if self.in_range(center) else None
+
+    def in_range(self, center_time):
+        distance = abs((center_time - self._reference_time()).total_seconds())
+        return distance <= self.max_distance_seconds
+
+    # ---------- jobs ----------
+    def submit(self, center_time, prefetch=False):
+        """
+        Returns the job for the window around center_time, starting it if needed.
+        Windows another process already stored are returned as done.
+        Prefetches are dropped when the pool is already busy or out of range;
+        explicit requests out of range raise ValueError.
+        """
+        center = self.quantize(center_time)
+        if not self.in_range(center):
+            if prefetch:
+                return None
+            raise ValueError("Window too far from the current ephemeris")
+        job_id = self.job_id_for(center)
+        key = f"{job_id}-{self._version()}"
+
+        with self._lock:
+            job = self._reusable_job(key, prefetch)
+            if job is not None:
+                return job
+
+        stored = PrecompressedPayload.load(self._path(key))
+
+        with self._lock:
+            job = self._reusable_job(key, prefetch)
+            if job is not None:
+                return job
+
+            if stored is None:
+                pending = sum(1 for j in self._jobs.values() if j['status'] in ('queued', 'running'))
+                if prefetch and pending >= self.max_pending:
+                    return None
+
+            job = {
+                'job_id': job_id,
+                'key': key,
+                'center_time': center,
+                'status': 'queued' if stored is None else 'done',
+                'progress': 0.0 if stored is None else 1.0,
+                'result': stored,
+                'error': None
+            }
+            self._jobs[key] = job
+            self._evict()
+
+        if stored is None:
+            self._executor.submit(self._run, job)
+        return job
+
+    def prefetch_neighbours(self, center_time, distance_buckets):
+        """Starts the windows before and after center_time (no-op if cached/running)."""
+        offset = datetime.timedelta(seconds=self.bucket_seconds * distance_buckets)
+        for neighbour in (center_time + offset, center_time - offset):
+            self.submit(neighbour, prefetch=True)
+
+    def clear(self):
+        """Drops in-memory windows (e.g. after config/TLE changes); running jobs finish unseen."""
+        with self._lock:
+            self._jobs.clear()
+
+    def _reusable_job(self, key, prefetch):
+        # Caller holds the lock. Failed windows are retried on the next explicit request.
+        job = self._jobs.get(key)
+        if job is not None and (prefetch or job['status'] != 'error'):
+            self._jobs.move_to_end(key)
+            return job
+        return None
+
+    def _evict(self):
+        # Caller holds the lock. Only finished jobs are evicted, oldest first.
+        finished = [key for key, j in self._jobs.items() if j['status'] in ('done', 'error')]
+        while len(finished) > self.max_windows:
+            del self._jobs[finished.pop(0)]
+
+    def _run(self, job):
+        path = self._path(job['key'])
+        lock_file = None
+
+        def progress(done, total):
+            value = round(done / total, 3) if total else 1.0
+            # Shared with processes waiting on the lock, in coarse steps
+            if int(value * 20) != int(job['progress'] * 20):
+                self._write_progress(path, value)
+            job['progress'] = value
+
+        try:
+            lock_file = self._acquire_window_lock(job)
+            result = PrecompressedPayload.load(path)  # Finished by the process we waited for?
+            if result is None:
+                job['status'] = 'running'
+                result = self._compute(job['center_time'], progress)
+                result.save(path)
+                self._prune_store()
+            job['result'] = result
+            job['progress'] = 1.0
+            job['status'] = 'done'
+        except Exception as e:
+            print(f"{Fore.RED}Ephemeris job {job['job_id']} failed: {e}{Fore.RESET}")
+            job['error'] = str(e)
+            job['status'] = 'error'
+        finally:
+            if lock_file is not None:
+                lock_file.close()  # Releases the flock
+            self._remove(path + '.progress')
+
+        with self._lock:
+            self._evict()
+
+    # ---------- shared store ----------
+    def _path(self, key):
+        # Prefix of the stored files (PrecompressedPayload.save adds the suffixes)
+        return os.path.join(self.store_dir, key)
+
+    def _acquire_window_lock(self, job):
+        """
+        Exclusive lock for one window across processes (version-independent, so
+        lock files stay few). While another process holds it, the job reports
+        as running with that process's progress. Returns the open lock file.
+        """
+        os.makedirs(self.store_dir, exist_ok=True)
+        if fcntl is None:
+            return None
+
+        lock_path = os.path.join(self.store_dir, f"{job['job_id']}.lock")
+        progress_path = self._path(job['key']) + '.progress'
+        f = open(lock_path, 'a')
+        os.utime(lock_path)  # Marks it as in use for _prune_store
+        while True:
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return f
+            except OSError:
+                job['status'] = 'running'
+                try:
+                    with open(progress_path, 'r') as p:
+                        job['progress'] = float(p.read() or 0)
+                except (OSError, ValueError):
+                    pass
+                time.sleep(LOCK_POLL_SECONDS)
+
+    def _write_progress(self, path, value):
+        try:
+            tmp_path = f"{path}.progress.{os.getpid()}"
+            with open(tmp_path, 'w') as f:
+                f.write(str(value))
+            os.replace(tmp_path, path + '.progress')
+        except OSError:
+            pass
+
+    def _prune_store(self):
+        """
+        Keeps the max_stored most recently written windows (any version) on
+        disk, plus the lock files of those and of recently started windows.
+        """
+        try:
+            names = os.listdir(self.store_dir)
+            stored = [os.path.join(self.store_dir, name) for name in names if name.endswith('.json')]
+            stored.sort(key=lambda p: os.path.getmtime(p), reverse=True)
+        except OSError:
+            return  # Another process pruned concurrently
+        for path in stored[self.max_stored:]:
+            # Body first: without it load() ignores the leftover variants
+            self._remove(path)
+            prefix = path[:-len('.json')]
+            for suffix in PrecompressedPayload.FILE_SUFFIXES.values():
+                self._remove(prefix + suffix)
+
+        kept_ids = {os.path.basename(path).split('-', 1)[0] for path in stored[:self.max_stored]}
+        stale_before = time.time() - STALE_LOCK_SECONDS
+        for name in names:
+            if not name.endswith('.lock') or name[:-len('.lock')] in kept_ids:
+                continue
+            path = os.path.join(self.store_dir, name)
+            try:
+                if os.path.getmtime(path) < stale_before:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
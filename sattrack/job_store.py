@@ -0,0 +1,109 @@
+import json
+import os
+from contextlib import contextmanager
+from colorama import Fore
+from . import config
+
+try:
+    import fcntl
+except ImportError:  # Windows: only the single-process dev server is supported
+    fcntl = None
+
+# Held open for the lifetime of the leader process; the OS releases it on exit
+_leader_lock_file = None
+
+@contextmanager
+def _exclusive_lock(path):
+    """Cross-process lock on a sidecar file (no-op without fcntl)."""
+    if fcntl is None:
+        yield
+        return
+    with open(path, 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+def try_acquire_leadership(lock_path=config.LEADER_LOCK_FILE):
+    """
+    Elects a single process to run the scheduler and TLE refresh.
+    Non-blocking: returns True only in the process that holds the lock.
+    """
+    global _leader_lock_file
+    if _leader_lock_file is not None:
+        return True
+    if fcntl is None:
+        _leader_lock_file = True
+        return True
+
+    os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+    f = open(lock_path, 'a')
+    try:
+        fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        f.close()
+        return False
+    _leader_lock_file = f
+    return True
+
+def load_jobs(filepath=config.SCHEDULED_JOBS_FILE):
+    """Returns {job_id: job_info} shared by all worker processes."""
+    try:
+        if not os.path.exists(filepath):
+            return {}
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        print(Fore.RED + f"Error loading scheduled jobs: {e}")
+        return {}
+
+def update_jobs(mutate, filepath=config.SCHEDULED_JOBS_FILE):
+    """
+    Read-modify-write of the job file under an exclusive lock.
+    `mutate(jobs)` edits the dict in place; its return value is passed through.
+    The file is only rewritten if the jobs actually changed.
+    """
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    with _exclusive_lock(filepath + '.lock'):
+        jobs = load_jobs(filepath)
+        before = json.dumps(jobs, sort_keys=True)
+        result = mutate(jobs)
+        if json.dumps(jobs, sort_keys=True) == before:
+            return result
+
+        # Atomic replace so lock-free readers never see a partial file
+        tmp_path = filepath + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(jobs, f)
+        os.replace(tmp_path, filepath)
+    return result
+
+# Doppler curves (up to MAX_DOPPLER_WINDOW_SECONDS samples) are kept out of the
+# job file so the leader's 5 s sync and /api/scheduled stay cheap.
+def _doppler_path(job_id, directory):
+    if os.path.basename(job_id) != job_id:
+        raise ValueError(f"Invalid job id: {job_id}")
+    return os.path.join(directory, f"{job_id}.json")
+
+def save_doppler(job_id, curve, directory=config.DOPPLER_DIR):
+    os.makedirs(directory, exist_ok=True)
+    path = _doppler_path(job_id, directory)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(curve, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+def load_doppler(job_id, directory=config.DOPPLER_DIR):
+    """Stored curve of a scheduled job, or None."""
+    try:
+        with open(_doppler_path(job_id, directory), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def delete_doppler(job_id, directory=config.DOPPLER_DIR):
+    try:
+        os.remove(_doppler_path(job_id, directory))
+    except (OSError, ValueError):
+        pass
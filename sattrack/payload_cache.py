@@ -0,0 +1,92 @@
+import gzip
+import json
+import hashlib
+import os
+
+try:
+    import brotli
+except ImportError:  # flask-compress normally pulls it in
+    brotli = None
+
+
+class PrecompressedPayload:
+    """
+    JSON body serialized once, together with its gzip/brotli variants.
+    Serving it costs no encoding work per request. The strong ETag is a hash
+    of the uncompressed body, so it changes exactly when the content does;
+    compressed variants get an encoding suffix since a strong validator must
+    differ between content codings.
+    """
+
+    # File suffix per stored variant (see save/load)
+    FILE_SUFFIXES = {'gzip': '.gz', 'br': '.br'}
+
+    def __init__(self, data, variants=None):
+        """`data` is JSON-serialized; pass bytes plus `variants` to wrap an already encoded body."""
+        if isinstance(data, bytes):
+            self.body = data
+        else:
+            self.body = json.dumps(data, separators=(',', ':')).encode('utf-8')
+        self.etag = hashlib.sha1(self.body).hexdigest()
+
+        if variants is not None:
+            self.variants = variants
+            return
+        self.variants = {
+            'gzip': gzip.compress(self.body, compresslevel=6),
+        }
+        if brotli is not None:
+            self.variants['br'] = brotli.compress(self.body, quality=9)
+
+    def etag_for(self, encoding):
+        return self.etag if encoding is None else f"{self.etag}-{encoding}"
+
+    def etags(self):
+        """ETags of all variants; any of them identifies this version."""
+        return [self.etag] + [self.etag_for(encoding) for encoding in self.variants]
+
+    def select(self, accept_encodings):
+        """
+        Picks the smallest variant the client accepts.
+        `accept_encodings` is werkzeug's parsed Accept-Encoding header.
+        Returns: (content_encoding or None, bytes)
+        """
+        best = (None, self.body)
+        for encoding, data in self.variants.items():
+            if accept_encodings.quality(encoding) > 0 and len(data) < len(best[1]):
+                best = (encoding, data)
+        return best
+
+    def save(self, path):
+        """
+        Stores the body as `<path>.json` and each variant next to it (`.gz`, `.br`),
+        for other worker processes to load(). The body is replaced last, so its
+        presence means the variants are complete.
+        """
+        for encoding, data in self.variants.items():
+            self._write_atomic(path + self.FILE_SUFFIXES[encoding], data)
+        self._write_atomic(path + '.json', self.body)
+
+    @classmethod
+    def load(cls, path):
+        """Payload written by save(), or None if there is none (yet). The ETag is recomputed from the body."""
+        try:
+            with open(path + '.json', 'rb') as f:
+                body = f.read()
+        except OSError:
+            return None
+        variants = {}
+        for encoding, suffix in cls.FILE_SUFFIXES.items():
+            try:
+                with open(path + suffix, 'rb') as f:
+                    variants[encoding] = f.read()
+            except OSError:
+                pass  # Served uncompressed (or via another variant) instead
+        return cls(body, variants)
+
+    @staticmethod
+    def _write_atomic(path, data):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
@@ -1,14 +1,123 @@
 import os
 import datetime
+import threading
+import numpy as np
 import requests
-from skyfield.api import load
+from sgp4.api import Satrec
+from skyfield.api import load, EarthSatellite
 from colorama import Fore
 from . import config
 
+EARTH_RADIUS_WGS72_KM = 6378.135
+MU_EARTH_KM3_S2 = 398600.8
+
+def _alpha5_to_int(s):
+    """Decodes NORAD IDs in TLE Alpha-5 format ('A0001' = 100001; I and O are skipped)."""
+    s = s.strip()
+    if not s[:1].isalpha():
+        return int(s)
+    c = s[0].upper()
+    n = ord(c) - ord('A') + 10
+    n -= c > 'I'
+    n -= c > 'O'
+    return n * 10000 + int(s[1:])
+
+def _tle_epoch_jd(line1):
+    """Julian date of the TLE epoch field (YYDDD.DDDDDDDD)."""
+    yy = int(line1[18:20])
+    year = 2000 + yy if yy < 57 else 1900 + yy
+    day_of_year = float(line1[20:32])
+    jan1 = datetime.datetime(year, 1, 1, tzinfo=datetime.timezone.utc)
+    return 2440587.5 + jan1.timestamp() / 86400.0 + day_of_year - 1.0
+
+class SatelliteCatalog:
+    """
+    Column-oriented TLE catalog: NORAD ID, name, epoch, orbit shape and the raw
+    TLE lines as NumPy arrays. EarthSatellite objects are only built (and
+    memoized) for satellites that are actually propagated.
+    """
+
+    def __init__(self, names, lines1, lines2, ts=None):
+        self.ts = ts or load.timescale()
+        self.names = np.array(names, dtype=str)
+        self.line1 = np.array(lines1, dtype='S69')
+        self.line2 = np.array(lines2, dtype='S69')
+        self.norad_ids = np.array([_alpha5_to_int(l1[2:7]) for l1 in lines1], dtype=np.int64)
+        self.epochs_jd = np.array([_tle_epoch_jd(l1) for l1 in lines1], dtype=float)
+        self.eccentricity = np.array([float('0.' + l2[26:33].strip()) for l2 in lines2], dtype=float)
+        self.mean_motion = np.array([float(l2[52:63]) for l2 in lines2], dtype=float)  # rev/day
+
+        # Search columns; first occurrence wins for duplicate IDs, like a linear scan
+        self._names_lower = np.char.lower(self.names)
+        self._id_strings = self.norad_ids.astype(str)
+        ids_first = self.norad_ids[::-1]
+        self._index = dict(zip(ids_first.tolist(), range(len(ids_first) - 1, -1, -1)))
+
+        self._sats = {}
+        self._sats_lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, path, ts=None):
+        """Parses 2- or 3-line TLE files without constructing satellite objects."""
+        names, lines1, lines2 = [], [], []
+        with open(path, 'r', encoding='ascii', errors='replace') as f:
+            lines = [line.rstrip() for line in f if line.strip()]
+
+        prev = None
+        i = 0
+        while i < len(lines) - 1:
+            l1, l2 = lines[i], lines[i + 1]
+            if l1.startswith('1 ') and l2.startswith('2 '):
+                names.append(prev.strip() if prev and not prev.startswith(('1 ', '2 ')) else l1[2:7].strip())
+                lines1.append(l1)
+                lines2.append(l2)
+                prev = None
+                i += 2
+            else:
+                prev = l1
+                i += 1
+        return cls(names, lines1, lines2, ts)
+
+    def __len__(self):
+        return len(self.norad_ids)
+
+    def index_of(self, norad_id):
+        return self._index.get(int(norad_id))
+
+    def satrec(self, i):
+        """Fresh Satrec for catalog row i (not memoized - for bulk screening)."""
+        return Satrec.twoline2rv(self.line1[i].decode('ascii'), self.line2[i].decode('ascii'))
+
+    def get(self, norad_id):
+        """Memoized EarthSatellite for a NORAD ID, or None if not in the catalog."""
+        i = self.index_of(norad_id)
+        if i is None:
+            return None
+        with self._sats_lock:
+            sat = self._sats.get(i)
+            if sat is None:
+                sat = EarthSatellite(self.line1[i].decode('ascii'), self.line2[i].decode('ascii'),
+                                     str(self.names[i]), self.ts)
+                self._sats[i] = sat
+            return sat
+
+    def altitude_bands_km(self):
+        """(N, 2) perigee/apogee altitudes from the mean elements, without propagating."""
+        n_rad_s = self.mean_motion * 2 * np.pi / 86400.0
+        with np.errstate(divide='ignore'):
+            a_km = np.cbrt(MU_EARTH_KM3_S2 / n_rad_s ** 2)
+        return np.column_stack((a_km * (1 - self.eccentricity) - EARTH_RADIUS_WGS72_KM,
+                                a_km * (1 + self.eccentricity) - EARTH_RADIUS_WGS72_KM))
+
+    def search(self, query, limit=20):
+        """Rows whose lower-case name or NORAD ID contains `query`, in catalog order."""
+        mask = (np.char.find(self._names_lower, query) >= 0) | (np.char.find(self._id_strings, query) >= 0)
+        return [(int(self.norad_ids[i]), str(self.names[i])) for i in np.flatnonzero(mask)[:limit]]
+
 def get_tle_data(cache_file=config.TLE_CACHE_FILE, max_age_days=config.TLE_UPDATE_INTERVAL_DAYS):
     """
     Ensures valid TLE data exists locally. Downloads if missing or old.
-    Returns: List of EarthSatellite objects.
+    Returns: SatelliteCatalog (satellite objects are built on demand).
     """
     download_needed = False
     
@@ -22,7 +131,7 @@ def get_tle_data(cache_file=config.TLE_CACHE_FILE, max_age_days=config.TLE_UPDAT
             download_needed = True
         except OSError:
              print(f"{Fore.RED}Could not remove directory. Please delete {cache_file} manually.{Fore.RESET}")
-             return []
+             return SatelliteCatalog([], [], [])
 
     # 2. Check if file exists and is valid
     if not os.path.exists(cache_file):
@@ -57,18 +166,17 @@ def get_tle_data(cache_file=config.TLE_CACHE_FILE, max_age_days=config.TLE_UPDAT
             print(f"{Fore.RED}TLE Download Failed: {e}")
             # Try to use existing file even if old
             if not os.path.exists(cache_file):
-                return []
+                return SatelliteCatalog([], [], [])
 
     try:
-        # Skyfield loader
-        return load.tle_file(cache_file)
+        return SatelliteCatalog.from_file(cache_file)
     except Exception as e:
         print(f"{Fore.RED}Error parsing TLE file: {e}")
-        return []
+        return SatelliteCatalog([], [], [])
 
 def filter_satellites(all_sats, config_data):
     """
-    Filters the full list of satellites to only those in our config.
+    Filters a SatelliteCatalog (or a list of satellites) to those in our config.
     Returns a list of EarthSatellite objects enriched with config names.
     """
     target_ids = set()
@@ -76,6 +184,10 @@ def filter_satellites(all_sats, config_data):
         if k.isdigit():
             target_ids.add(int(k))
     
+    if isinstance(all_sats, SatelliteCatalog):
+        # Index lookup - only the configured satellites get materialized
+        all_sats = [sat for sat in map(all_sats.get, sorted(target_ids)) if sat is not None]
+    
     my_sats = []
     for sat in all_sats:
         sat_id = sat.model.satnum
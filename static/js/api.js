@@ -65,31 +65,65 @@ function loadEphemeris(centerTime, cb) {
     isLoadingEphemeris = true;
     let url = '/api/ephemeris';
     if (centerTime) {
-        url += '?center_time=' + new Date(centerTime).toISOString();
+        // Async mode: server answers 202 + poll URL while the window is computed
+        url += '?center_time=' + new Date(centerTime).toISOString() + '&async=1';
     }
 
-    $.get(url, function (data) {
-        ephemerisData = data.ephemeris;
-        satelliteMeta = data.satellites;
-        minElevation = data.min_elevation || 5;
-
-        // Calculate ephemeris bounds
-        let firstKey = Object.keys(ephemerisData)[0];
-        if (firstKey && ephemerisData[firstKey].length > 0) {
-            let pts = ephemerisData[firstKey];
-            ephemerisStartTs = pts[0][0] * 1000;
-            ephemerisEndTs = pts[pts.length - 1][0] * 1000;
+    fetchEphemeris(url, cb);
+}
+
+function fetchEphemeris(url, cb) {
+    $.ajax({
+        url: url,
+        dataType: 'json',
+        success: function (data, textStatus, xhr) {
+            if (xhr.status === 202) {
+                showEphemerisProgress(data.progress);
+                setTimeout(() => fetchEphemeris(data.poll_url, cb), 500);
+                return;
+            }
+            showEphemerisProgress(null);
+            applyEphemeris(data, cb);
+        },
+        error: function () {
+            // Allow checkEphemerisBounds to retry
+            showEphemerisProgress(null);
+            isLoadingEphemeris = false;
         }
+    });
+}
 
-        isDataLoaded = true;
-        isLoadingEphemeris = false;
+function applyEphemeris(data, cb) {
+    ephemerisData = data.ephemeris;
+    satelliteMeta = data.satellites;
+    if (useCanvasRenderer) SatCanvas.setEphemeris();
+    minElevation = data.min_elevation || 5;
+
+    // Calculate ephemeris bounds
+    let firstKey = Object.keys(ephemerisData)[0];
+    if (firstKey && ephemerisData[firstKey].length > 0) {
+        let pts = ephemerisData[firstKey];
+        ephemerisStartTs = pts[0][0] * 1000;
+        ephemerisEndTs = pts[pts.length - 1][0] * 1000;
+    }
 
-        calculatePassesClientSide();
-        updateVisuals(true);
-        renderPassList();
+    isDataLoaded = true;
+    isLoadingEphemeris = false;
 
-        if (cb) cb();
-    });
+    calculatePassesClientSide();
+    updateVisuals(true);
+    renderPassList();
+
+    if (cb) cb();
+}
+
+function showEphemerisProgress(progress) {
+    let el = $('#ephemeris-status');
+    if (progress === null || progress === undefined) {
+        el.addClass('d-none');
+        return;
+    }
+    el.removeClass('d-none').html(`<i class="fa-solid fa-spinner fa-spin me-1"></i> Ephemeris ${Math.round(progress * 100)}%`);
 }
 
 function saveConfig() {
@@ -21,10 +21,21 @@ function initMap() {
     }).addTo(map);
 
     L.control.zoom({ position: 'topright' }).addTo(map);
-    map.on('click', () => { selectedSatId = null; updateVisuals(true); });
+    map.on('click', (e) => {
+        let hit = useCanvasRenderer ? SatCanvas.hitTest(e.containerPoint) : null;
+        if (hit) { selectSat(hit); return; }
+        selectedSatId = null; updateVisuals(true);
+    });
+
+    if (useCanvasRenderer) SatCanvas.init();
 }
 
 function updateVisuals(forceTrajectory) {
+    if (useCanvasRenderer) {
+        SatCanvas.draw();
+        return;
+    }
+
     let simSec = simulationTime / 1000.0;
 
     Object.keys(ephemerisData).forEach((id, idx) => {
@@ -175,6 +186,253 @@ function updateSatVisuals(id, pos, idx, points, currentIdx) {
     }
 }
 
+// ========== CANVAS RENDERER ==========
+// Draws all satellites, footprints, tracks and labels on two canvases instead of
+// one Leaflet layer per object. Track geometry is projected once per ephemeris
+// (zoom 0 Web-Mercator pixels) and only scaled/offset when drawn; the track
+// canvas is redrawn only when the view, toggles or a track's index change.
+const SatCanvas = {
+    trackCanvas: null,
+    trackCtx: null,
+    satCanvas: null,
+    satCtx: null,
+    tracks: {},       // id -> { x: Float64Array, y: Float64Array, lon: Float32Array }
+    drawn: [],        // Satellites drawn last frame: { id, x, y, lat, lon, text }
+    trackKey: '',
+    hoverId: null,
+    tooltip: null,
+
+    init: function () {
+        let pane = map.createPane('satCanvasPane');
+        pane.style.zIndex = 450;
+        pane.style.pointerEvents = 'none';
+
+        // leaflet-zoom-hide: hidden during the zoom animation, redrawn on zoomend
+        this.trackCanvas = L.DomUtil.create('canvas', 'leaflet-zoom-hide', pane);
+        this.satCanvas = L.DomUtil.create('canvas', 'leaflet-zoom-hide', pane);
+        this.trackCtx = this.trackCanvas.getContext('2d');
+        this.satCtx = this.satCanvas.getContext('2d');
+
+        this.tooltip = L.tooltip({ direction: 'top', offset: [0, -8] });
+
+        map.on('moveend zoomend resize', () => { this.trackKey = ''; this.draw(); });
+        map.on('mousemove', (e) => this.onHover(e));
+        map.on('mouseout', () => this.setHover(null));
+    },
+
+    // Called whenever ephemerisData is replaced
+    setEphemeris: function () {
+        this.tracks = {};
+        this.trackKey = '';
+    },
+
+    // Spherical Mercator (EPSG:3857) at zoom 0, same as map.project(latlng, 0)
+    worldX: function (lon) {
+        return (lon + 180) / 360 * 256;
+    },
+
+    worldY: function (lat) {
+        let s = Math.sin(Math.max(-85.0511, Math.min(85.0511, lat)) * Math.PI / 180);
+        return 128 - 64 * Math.log((1 + s) / (1 - s)) / Math.PI;
+    },
+
+    project: function (points) {
+        let n = points.length;
+        let track = { x: new Float64Array(n), y: new Float64Array(n), lon: new Float32Array(n) };
+        for (let i = 0; i < n; i++) {
+            track.x[i] = this.worldX(points[i][2]);
+            track.y[i] = this.worldY(points[i][1]);
+            track.lon[i] = points[i][2];
+        }
+        return track;
+    },
+
+    trackFor: function (id) {
+        if (!this.tracks[id]) this.tracks[id] = this.project(ephemerisData[id]);
+        return this.tracks[id];
+    },
+
+    // Zoom-0 pixel -> container pixel: x * scale - ox
+    view: function () {
+        let scale = Math.pow(2, map.getZoom());
+        let origin = map.getPixelOrigin();
+        let topLeft = map.containerPointToLayerPoint([0, 0]);
+        return { scale: scale, ox: origin.x + topLeft.x, oy: origin.y + topLeft.y, topLeft: topLeft };
+    },
+
+    // Sizes a canvas to the map and pins it to the container's top-left corner
+    prepare: function (canvas, ctx, view) {
+        let size = map.getSize();
+        let dpr = window.devicePixelRatio || 1;
+        // Canvas dimensions are integers; comparing unrounded sizes would reset the canvas every frame
+        let width = Math.round(size.x * dpr), height = Math.round(size.y * dpr);
+        if (canvas.width !== width || canvas.height !== height) {
+            canvas.width = width;
+            canvas.height = height;
+            canvas.style.width = size.x + 'px';
+            canvas.style.height = size.y + 'px';
+        }
+        L.DomUtil.setPosition(canvas, view.topLeft);
+        ctx.setTransform(dpr, 0, 0, dpr, 0, 0);
+        ctx.clearRect(0, 0, size.x, size.y);
+    },
+
+    draw: function () {
+        if (!this.satCtx) return;
+        let view = this.view();
+        let simSec = simulationTime / 1000.0;
+        let sats = [];
+
+        Object.keys(ephemerisData).forEach((id, idx) => {
+            let points = ephemerisData[id];
+            let pos = interpolatePos(points, simSec);
+            if (!pos) return;
+
+            let alt = pos.alt || 600;
+            let dist = getSlantRangeKm(stationLoc.lat, stationLoc.lon, pos.lat, pos.lon, alt);
+            let radius = getSatRadius(id);
+            let el = calcElevation(getGroundDistKm(stationLoc.lat, stationLoc.lon, pos.lat, pos.lon), alt);
+            let inRange = (dist < radius) && (el >= minElevation);
+            let name = (satelliteMeta[id] ? satelliteMeta[id].name : id);
+            let status = inRange ? '✓ ACTIVE' : (el < minElevation ? 'Below Horizon' : 'Out of Range');
+
+            sats.push({
+                id: id, idx: pos.idx, lat: pos.lat, lon: pos.lon, name: name,
+                color: mapColors[idx % mapColors.length], inRange: inRange, radius: radius,
+                x: this.worldX(pos.lon) * view.scale - view.ox,
+                y: this.worldY(pos.lat) * view.scale - view.oy,
+                text: `${name} | ${dist.toFixed(0)}km | El: ${el.toFixed(1)}° | ${status}`
+            });
+        });
+
+        this.drawTracks(sats, view);
+        this.drawSats(sats, view);
+        this.drawn = sats;
+
+        if (this.hoverId) {
+            let hovered = sats.find(s => s.id === this.hoverId);
+            if (hovered) this.tooltip.setLatLng([hovered.lat, hovered.lon]).setContent(hovered.text);
+            else this.setHover(null);
+        }
+    },
+
+    drawTracks: function (sats, view) {
+        let shown = sats.filter(s => s.id == selectedSatId || showAllTracks);
+        let key = [view.scale, view.ox, view.oy, map.getSize().x, map.getSize().y, selectedSatId, showAllTracks]
+            .concat(shown.map(s => s.id + ':' + s.idx)).join('|');
+        if (key === this.trackKey) return;
+        this.trackKey = key;
+
+        let ctx = this.trackCtx;
+        this.prepare(this.trackCanvas, ctx, view);
+
+        shown.forEach(sat => {
+            let isSel = (sat.id == selectedSatId);
+            let track = this.trackFor(sat.id);
+            let windowSize = isSel ? 360 : 120;
+            let skipFactor = isSel ? 1 : 3;
+            let startIdx = Math.max(0, sat.idx - windowSize);
+            let endIdx = Math.min(track.x.length, sat.idx + windowSize);
+
+            ctx.strokeStyle = sat.color;
+            ctx.globalAlpha = isSel ? 0.9 : 0.4;
+            ctx.lineWidth = isSel ? 3 : 2;
+
+            ctx.setLineDash([4, 8]);
+            this.strokeTrack(ctx, track, view, startIdx, sat.idx + 1, skipFactor);
+            ctx.setLineDash([]);
+            this.strokeTrack(ctx, track, view, sat.idx, endIdx, skipFactor);
+        });
+        ctx.globalAlpha = 1;
+    },
+
+    strokeTrack: function (ctx, track, view, iStart, iEnd, skipFactor) {
+        ctx.beginPath();
+        let prev = -1;
+        for (let i = iStart; i < iEnd; i += skipFactor) {
+            let x = track.x[i] * view.scale - view.ox;
+            let y = track.y[i] * view.scale - view.oy;
+            // Break the line at the antimeridian
+            if (prev < 0 || Math.abs(track.lon[i] - track.lon[prev]) > 100) ctx.moveTo(x, y);
+            else ctx.lineTo(x, y);
+            prev = i;
+        }
+        ctx.stroke();
+    },
+
+    drawSats: function (sats, view) {
+        let ctx = this.satCtx;
+        this.prepare(this.satCanvas, ctx, view);
+        // World pixels per meter at the equator; footprints scale with 1/cos(lat)
+        let pxPerMeter = 256 * view.scale / (2 * Math.PI * 6378137);
+
+        sats.forEach(sat => {
+            if (sat.id == selectedSatId || showRadii) {
+                let r = sat.radius * 1000 * pxPerMeter / Math.max(0.01, Math.cos(sat.lat * Math.PI / 180));
+                ctx.beginPath();
+                ctx.arc(sat.x, sat.y, r, 0, 2 * Math.PI);
+                ctx.globalAlpha = 0.05;
+                ctx.fillStyle = sat.color;
+                ctx.fill();
+                ctx.globalAlpha = 0.5;
+                ctx.lineWidth = 1;
+                ctx.strokeStyle = sat.color;
+                ctx.stroke();
+            }
+        });
+
+        sats.forEach(sat => {
+            let color = sat.inRange ? '#00FF00' : sat.color;
+            ctx.beginPath();
+            ctx.arc(sat.x, sat.y, (sat.id == selectedSatId) ? 12 : 8, 0, 2 * Math.PI);
+            ctx.globalAlpha = sat.inRange ? 1 : 0.6;
+            ctx.fillStyle = sat.color;
+            ctx.fill();
+            ctx.lineWidth = 2;
+            ctx.strokeStyle = color;
+            ctx.stroke();
+        });
+        ctx.globalAlpha = 1;
+
+        if (showSatNames) {
+            ctx.font = 'bold 14px sans-serif';
+            ctx.textAlign = 'center';
+            ctx.textBaseline = 'bottom';
+            ctx.fillStyle = 'white';
+            ctx.shadowColor = 'black';
+            ctx.shadowBlur = 3;
+            sats.forEach(sat => ctx.fillText(sat.name, sat.x, sat.y - 15));
+            ctx.shadowBlur = 0;
+        }
+    },
+
+    // Returns the id of the satellite under a container point, if any
+    hitTest: function (point) {
+        let best = null;
+        let bestDist = 12;
+        this.drawn.forEach(sat => {
+            let d = Math.hypot(sat.x - point.x, sat.y - point.y);
+            if (d <= bestDist) { best = sat.id; bestDist = d; }
+        });
+        return best;
+    },
+
+    onHover: function (e) {
+        this.setHover(this.hitTest(e.containerPoint));
+    },
+
+    setHover: function (id) {
+        if (id === this.hoverId) return;
+        this.hoverId = id;
+        map.getContainer().style.cursor = id ? 'pointer' : '';
+        if (!id) { map.closeTooltip(this.tooltip); return; }
+
+        let sat = this.drawn.find(s => s.id === id);
+        this.tooltip.setLatLng([sat.lat, sat.lon]).setContent(sat.text);
+        map.openTooltip(this.tooltip);
+    }
+};
+
 // ========== POLAR PLOT MODULE ==========
 const PolarPlot = {
     canvas: null,
@@ -37,4 +37,6 @@ let lastTrajectoryUpdate = 0;
 // Config
 let mapColors = ['#FF3333', '#33FF33', '#3333FF', '#FFFF33', '#FF33FF', '#33FFFF', '#FFA500', '#FF6B6B'];
 let showSatNames = true;
+// Single-canvas renderer (fast with many satellites); false = one Leaflet layer per object
+let useCanvasRenderer = true;
 let satLabels = {};